@@ -7,29 +7,195 @@ including prompt loading, response generation, and metadata writing.
 
 Schema-related functionality has been moved to schema_loader.py
 to maintain a single source of truth from template files.
+
+JSON serialization uses orjson when installed (pip install orjson),
+otherwise the stdlib json module.
 """
+import functools
 import json
+import mmap
+import os
+import platform
+import re
+import socket
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; stdlib json is used when it is not installed
+    orjson = None
+
+
+def dump_json(obj, indent=False):
+    """
+    Serialize obj to a JSON string.
+
+    Uses orjson when available, falling back to the stdlib encoder.
+    Non-ASCII characters are emitted as-is (callers write UTF-8).
+
+    Args:
+        obj: Object to serialize
+        indent: If True, pretty-print with 2-space indentation
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder handles
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+def dump_json_bytes(obj, indent=False):
+    """
+    Serialize obj to UTF-8 encoded JSON bytes.
+
+    Same output as dump_json(), but skips the str round trip when the
+    result is headed for a file or a binary stream.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder handles
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+# orjson turns integers beyond 64 bits into floats without complaint; any
+# run of 19+ digits might be one, so such input is left to the stdlib
+# parser, which keeps them exact
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+
+def load_json(data):
+    """
+    Parse JSON from raw bytes, skipping a leading UTF-8 BOM if present.
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+            (orjson.JSONDecodeError is a subclass)
+    """
+    if data[:3] == b"\xef\xbb\xbf":
+        data = data[3:]
+    if orjson is not None and not _LONG_DIGITS.search(data):
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Files at least this large are parsed from a memory map (orjson only)
+MMAP_MIN_BYTES = 1024 * 1024
+
+
+def load_json_file(path):
+    """
+    Read and parse a JSON file, skipping a leading UTF-8 BOM if present.
+
+    With orjson, files of MMAP_MIN_BYTES or more are parsed straight from a
+    read-only memory map instead of being copied into a bytes object first.
+    Smaller files are read in one go, which is cheaper than mapping them.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the content is not valid JSON
+    """
+    with open(path, "rb") as fp:
+        if orjson is not None and os.fstat(fp.fileno()).st_size >= MMAP_MIN_BYTES:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _LONG_DIGITS.search(mm):
+                    return load_json(mm[:])
+                start = 3 if mm[:3] == b"\xef\xbb\xbf" else 0
+                with memoryview(mm) as view, view[start:] as body:
+                    return orjson.loads(body)
+        return load_json(fp.read())
+
+
+def write_file_bytes(path, data):
+    """
+    Write data to path in one go, replacing any existing content.
+
+    Goes straight to os.open/os.write instead of a buffered file object,
+    since the whole payload is already in memory. A short write (rare for
+    regular files) is retried with the remainder.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 
 def default_codex_cmd():
     """Get default Codex CLI command based on platform."""
     return "codex.cmd" if sys.platform.startswith("win") else "codex"
 
 
+# Host metadata for info.json; constant for the life of the process, and
+# platform.platform() can be slow (it may read files or spawn uname)
+_METADATA = {
+    "hostname": socket.gethostname(),
+    "platform": platform.platform(),
+    "python_version": sys.version,
+}
+
+# Path to template_info.json (.agent/templates/)
+INFO_TEMPLATE_PATH = Path(__file__).parent.parent.parent / "templates" / "template_info.json"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_prompt_cached(path_str, mtime_ns):
+    """Read and decode a prompt file; keyed on mtime so edits invalidate the cache."""
+    data = Path(path_str).read_bytes()
+    if data[:3] == b"\xef\xbb\xbf":
+        data = data[3:]
+    return data.decode("utf-8").strip()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_json_file_cached(path_str, mtime_ns):
+    """Read and parse a JSON file; keyed on mtime so edits invalidate the cache."""
+    return load_json(Path(path_str).read_bytes())
+
+
+def _load_info_template():
+    """
+    Load template_info.json (cached until the file changes).
+
+    Returns:
+        dict: Parsed template (shared, do not mutate), or None if missing
+    """
+    try:
+        mtime_ns = INFO_TEMPLATE_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_json_file_cached(str(INFO_TEMPLATE_PATH), mtime_ns)
+
+
 def load_prompt(path):
-    """Load subagent prompt from file."""
+    """Load subagent prompt from file (cached until the file changes)."""
     prompt_path = Path(path)
-    if not prompt_path.exists():
+    try:
+        mtime_ns = prompt_path.stat().st_mtime_ns
+    except FileNotFoundError:
         raise SystemExit(f"Prompt file not found: {prompt_path}")
-    return prompt_path.read_text(encoding="utf-8-sig").strip()
+    return _load_prompt_cached(str(prompt_path.resolve()), mtime_ns)
 
 
 def build_prompt(base_prompt, request_obj):
     """Build full prompt by combining base prompt with request JSON."""
-    request_json = json.dumps(request_obj, ensure_ascii=True, indent=2)
+    request_json = dump_json(request_obj, indent=True)
     return (
         f"{base_prompt}\n\n"
         "Request JSON:\n"
@@ -39,6 +205,19 @@ def build_prompt(base_prompt, request_obj):
     )
 
 
+def write_prompt(fp, base_prompt, request_obj):
+    """
+    Write the prompt build_prompt() would return to a binary file object.
+
+    The pieces are encoded and written one by one, so the full prompt is
+    never held as a single string (e.g. when feeding a subprocess stdin).
+    """
+    fp.write(base_prompt.encode("utf-8"))
+    fp.write(b"\n\nRequest JSON:\n```json\n")
+    fp.write(dump_json_bytes(request_obj, indent=True))
+    fp.write(b"\n```")
+
+
 def write_fallback_response(response_path, task_id, summary, issues):
     """
     Write a fallback response when Subagent execution fails.
@@ -46,21 +225,15 @@ def write_fallback_response(response_path, task_id, summary, issues):
     Response structure is loaded from template_response.json
     to maintain consistency with the template schema.
     """
-    from .schema_loader import load_response_template, get_response_default_values
+    from .schema_loader import get_response_default_values
 
     # Load template structure for consistency
     try:
-        template = load_response_template()
-        defaults = get_response_default_values()
-
-        # Build response using template structure
-        payload = {}
-        for key in template.keys():
-            if key in defaults:
-                payload[key] = defaults[key]
+        # Defaults cover every template field, in template order
+        payload = get_response_default_values()
 
         # Override with execution-specific values
-        payload["version"] = template.get("version", "1.0")
+        payload.setdefault("version", "1.0")
         payload["task_id"] = task_id or ""
         payload["status"] = "failed"
         payload["summary"] = summary
@@ -77,7 +250,7 @@ def write_fallback_response(response_path, task_id, summary, issues):
             "issues": issues if issues else [],
         }
 
-    response_path.write_text(json.dumps(payload, ensure_ascii=True, indent=2), encoding="utf-8")
+    write_file_bytes(response_path, dump_json_bytes(payload, indent=True))
 
 
 def write_info_file(
@@ -90,6 +263,7 @@ def write_info_file(
     working_directory=None,
     command_args=None,
     performance_metrics=None,
+    duration_seconds=None,
 ):
     """
     Write info.json with runtime execution data.
@@ -98,7 +272,8 @@ def write_info_file(
         output_dir: Directory to write info.json
         engine: Execution engine ('codex' or 'claude')
         model: Model name (for Claude engine) or profile (for Codex engine)
-        started_at: ISO timestamp of execution start
+        started_at: Execution start as a timezone-aware datetime
+            (an ISO timestamp string is also accepted)
         pid: Process ID
         exit_code: Exit code (None if still running)
         working_directory: Working directory path
@@ -108,29 +283,24 @@ def write_info_file(
             - prompt_tokens: Input tokens
             - completion_tokens: Output tokens
             - api_calls_count: Number of API calls
+        duration_seconds: Elapsed run time, preferably measured with
+            time.monotonic(). If omitted and started_at is a datetime, it is
+            derived from the wall clock when exit_code is set.
     """
-    import socket
-    import platform as platform_module
+    now = datetime.now(timezone.utc)
+    if started_at is None:
+        started_at = now
+    completed_at = now if exit_code is not None else None
+    if duration_seconds is None and completed_at and isinstance(started_at, datetime):
+        duration_seconds = (completed_at - started_at).total_seconds()
 
-    # Load template structure
+    # Load template structure (cached across calls)
     try:
-        from .schema_loader import load_response_template
-
-        # Try to load info template if it exists
-        template_path = Path(__file__).parent.parent.parent / "templates" / "template_info.json"
-        if template_path.exists():
-            template = json.loads(template_path.read_text(encoding="utf-8-sig"))
-        else:
-            # Fallback structure
-            template = {
-                "version": "1.0",
-                "execution_info": {},
-                "process_info": {},
-                "command_info": {},
-                "performance_metrics": {},
-                "metadata": {},
-            }
+        template = _load_info_template()
     except Exception:
+        template = None
+    if template is None:
+        # Fallback structure
         template = {
             "version": "1.0",
             "execution_info": {},
@@ -158,9 +328,9 @@ def write_info_file(
         "execution_info": {
             "engine": engine,
             "model": model or "",
-            "started_at": started_at or datetime.now(timezone.utc).isoformat(),
-            "completed_at": datetime.now(timezone.utc).isoformat() if exit_code is not None else None,
-            "duration_seconds": None,  # Will be calculated if both timestamps exist
+            "started_at": started_at.isoformat() if isinstance(started_at, datetime) else started_at,
+            "completed_at": completed_at.isoformat() if completed_at else None,
+            "duration_seconds": duration_seconds,
         },
         "process_info": {
             "pid": pid,
@@ -171,25 +341,12 @@ def write_info_file(
             "command_args": command_args or [],
         },
         "performance_metrics": default_metrics,
-        "metadata": {
-            "hostname": socket.gethostname(),
-            "platform": platform_module.platform(),
-            "python_version": sys.version,
-        },
+        "metadata": dict(_METADATA),
     }
 
-    # Calculate duration if both timestamps exist
-    if info["execution_info"]["started_at"] and info["execution_info"]["completed_at"]:
-        try:
-            start = datetime.fromisoformat(info["execution_info"]["started_at"].replace("Z", "+00:00"))
-            end = datetime.fromisoformat(info["execution_info"]["completed_at"].replace("Z", "+00:00"))
-            info["execution_info"]["duration_seconds"] = (end - start).total_seconds()
-        except Exception:
-            pass
-
     # Write to info.json (replaces info.md)
     info_path = Path(output_dir) / "info.json"
-    info_path.write_text(json.dumps(info, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_file_bytes(info_path, dump_json_bytes(info, indent=True))
 
 
 # Backward compatibility: export REQUIRED_FIELDS for existing imports
@@ -13,14 +13,16 @@ Subagent 执行模块
 
 from .init_audit_dir import ensure_subagent_paths
 from .validate_request import validate_request_file
-from .run_subagent_exec import execute_subagent
+from .run_subagent_exec import execute_subagent, kill_running_subagents
 from .run_subagent_claude import execute_subagent_claude
-from .validate_response import validate_response_file
+from .validate_response import validate_response_file, validate_response_obj
 
 __all__ = [
     "ensure_subagent_paths",
     "validate_request_file",
     "execute_subagent",
+    "kill_running_subagents",
     "execute_subagent_claude",
     "validate_response_file",
+    "validate_response_obj",
 ]
@@ -8,15 +8,25 @@ and returns the paths to request.json and response.json files.
 Optionally copies template files as placeholders for request.json.
 """
 import argparse
+import functools
 import json
+import os
 import shutil
 from pathlib import Path
 
 
+# Template directory relative to any candidate project root
+_TEMPLATE_SUFFIX = (".agent", "templates")
+
+
+@functools.lru_cache(maxsize=8)
 def _find_template_dir(start_dir=None):
     """
     Find the template directory by searching up from start_dir.
 
+    The result is cached per start_dir, so repeated subagent inits in one
+    process walk the parent directories only once.
+
     Args:
         start_dir: Directory to start searching from
 
@@ -24,14 +34,19 @@ def _find_template_dir(start_dir=None):
         Path: Found template directory or None
     """
     if start_dir is None:
-        start_dir = Path(__file__).parent.parent.parent
+        # This file lives in <root>/.agent/tools/lib/modules/, so try <root> first
+        here = Path(__file__).resolve()
+        template_dir = here.parents[4].joinpath(*_TEMPLATE_SUFFIX)
+        if os.path.isdir(template_dir):
+            return template_dir
+        start_dir = here.parent.parent.parent
 
     current = Path(start_dir).resolve()
 
     # Search up to 5 levels
     for _ in range(5):
-        template_dir = current / ".agent" / "templates"
-        if template_dir.exists():
+        template_dir = current.joinpath(*_TEMPLATE_SUFFIX)
+        if os.path.isdir(template_dir):
             return template_dir
         parent = current.parent
         if parent == current:  # Reached root
@@ -40,7 +55,7 @@ def _find_template_dir(start_dir=None):
 
     # Fallback to relative path from current directory
     fallback = Path(".agent/templates")
-    if fallback.exists():
+    if os.path.isdir(fallback):
         return fallback
 
     return None
@@ -87,7 +102,7 @@ def ensure_subagent_paths(audit_root, phase, task_name, subagent_name, request_p
         if template_dir:
             template_file = template_dir / "template_request.json"
             if template_file.exists():
-                shutil.copy(template_file, request_file)
+                shutil.copyfile(template_file, request_file)
 
     return request_file, response_file
 
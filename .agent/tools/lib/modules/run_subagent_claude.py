@@ -9,30 +9,43 @@ tools like Read, Write, Bash, etc.
 Required: pip install anthropic
 """
 import argparse
+import functools
+import itertools
 import json
 import os
+import shlex
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
 # Import utility functions
 try:
-    from ..lib import (
+    from .. import (
         load_prompt,
         build_prompt,
         write_info_file,
         write_fallback_response,
+        dump_json,
+        dump_json_bytes,
+        load_json_file,
+        write_file_bytes,
     )
 except ImportError:
-    # Fallback implementations when run as standalone script
-    import sys
-    sys.path.insert(0, str(Path(__file__).parent.parent))
+    # Run as a standalone script: import the same helpers from lib
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
     from lib import (
         load_prompt,
         build_prompt,
         write_info_file,
         write_fallback_response,
+        dump_json,
+        dump_json_bytes,
+        load_json_file,
+        write_file_bytes,
     )
 
 
@@ -40,13 +53,21 @@ except ImportError:
 TOOLS = [
     {
         "name": "read_file",
-        "description": "Read the complete contents of a file from the filesystem",
+        "description": "Read the contents of a file from the filesystem, optionally a range of lines",
         "input_schema": {
             "type": "object",
             "properties": {
                 "file_path": {
                     "type": "string",
                     "description": "Absolute or relative path to the file"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Line number to start reading from, 1-based (optional)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of lines to read (optional)"
                 }
             },
             "required": ["file_path"]
@@ -80,12 +101,17 @@ TOOLS = [
                     "type": "string",
                     "description": "The shell command to execute"
                 },
+                "argv": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Program and arguments to run directly without a shell (optional, used instead of command)"
+                },
                 "cwd": {
                     "type": "string",
                     "description": "Working directory for command execution (optional)"
                 }
             },
-            "required": ["command"]
+            "required": []
         }
     },
     {
@@ -104,7 +130,7 @@ TOOLS = [
     },
     {
         "name": "search_files",
-        "description": "Search for text patterns in files using ripgrep",
+        "description": "Search for text patterns in files using ripgrep (returns at most 200 matches)",
         "input_schema": {
             "type": "object",
             "properties": {
@@ -123,67 +149,236 @@ TOOLS = [
 ]
 
 
-def execute_tool(tool_name, tool_input):
-    """Execute a tool and return the result"""
+# Characters that need a real shell (pipes, redirection, expansion, globbing, ...)
+_SHELL_METACHARS = frozenset("|&;<>()$`*?[]{}~#!\n")
+
+
+def _split_command(command):
+    """
+    Split a command string into an argv list if it can run without a shell.
+
+    Returns:
+        list: argv, or None if the command needs shell features
+    """
+    if sys.platform.startswith("win") or any(c in _SHELL_METACHARS for c in command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    # Leading VAR=value assignments are a shell feature too
+    if not argv or "=" in argv[0]:
+        return None
+    return argv
+
+
+def _run_command(args, cwd, shell, timeout=300):
+    """Run a command, capturing its output; kills it if it exceeds timeout."""
+    proc = subprocess.Popen(
+        args,
+        shell=shell,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        raise
+    return {
+        "stdout": stdout,
+        "stderr": stderr,
+        "exit_code": proc.returncode
+    }
+
+
+# TOOLS as sent to the API, built once at import. The breakpoint after the
+# last tool lets the tools segment (which precedes the system prompt in the
+# cache prefix) be cached on its own and shared by runs whose system prompt
+# differs.
+API_TOOLS = TOOLS[:-1] + [{**TOOLS[-1], "cache_control": {"type": "ephemeral"}}]
+
+# Per-request output token limit
+MAX_TOKENS = 4096
+
+# Tool results longer than this are truncated before being sent back to
+# Claude, since every later request re-sends them (use read_file offset/limit
+# to page through large files). outputs in response.json keep the full result.
+MAX_TOOL_RESULT_CHARS = 32 * 1024
+
+# Maximum entries returned by list_directory
+LIST_MAX_ENTRIES = 5000
+
+# Limits for search_files results fed back to Claude
+SEARCH_MAX_MATCHES = 200
+SEARCH_MAX_BYTES = 64 * 1024
+
+
+def _search_files(pattern, search_path, timeout=60):
+    """
+    Run ripgrep and collect match records while its output streams in.
+
+    Reading stops (and rg is killed) once SEARCH_MAX_MATCHES matches or
+    SEARCH_MAX_BYTES of match output have been seen, so a broad pattern
+    cannot flood memory or the next request's prompt.
+
+    Returns:
+        dict: matches (path, line_number, text), truncated flag, exit_code
+    """
+    proc = subprocess.Popen(
+        ["rg", "--json", pattern, search_path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+    )
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    started = time.monotonic()
+
+    matches = []
+    match_bytes = 0
+    truncated = False
+    try:
+        for line in proc.stdout:
+            if not line.startswith('{"type":"match"'):
+                continue
+            match_bytes += len(line)
+            if len(matches) >= SEARCH_MAX_MATCHES or match_bytes > SEARCH_MAX_BYTES:
+                truncated = True
+                proc.kill()
+                break
+            data = json.loads(line)["data"]
+            matches.append({
+                "path": data["path"].get("text", ""),
+                "line_number": data.get("line_number"),
+                "text": data["lines"].get("text", ""),
+            })
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        proc.wait()
+
+    if not truncated and proc.returncode < 0 and time.monotonic() - started >= timeout:
+        raise subprocess.TimeoutExpired(proc.args, timeout)
+
+    return {
+        "matches": matches,
+        "truncated": truncated,
+        "exit_code": None if truncated else proc.returncode
+    }
+
+
+# search_files results keyed on (pattern, path, path mtime). Each tool loop
+# keeps its own cache dict, cleared whenever a tool that can modify files
+# runs; the lock covers read-only turns running tools on a thread pool.
+SEARCH_CACHE_SIZE = 64
+_search_cache_lock = threading.Lock()
+
+
+def _cached_search_files(pattern, search_path, search_cache):
+    """Return a cached search_files result, running rg only on a cache miss."""
+    try:
+        mtime_ns = os.stat(search_path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    key = (pattern, search_path, mtime_ns)
+    with _search_cache_lock:
+        result = search_cache.get(key)
+    if result is None:
+        result = _search_files(pattern, search_path)
+        with _search_cache_lock:
+            if len(search_cache) >= SEARCH_CACHE_SIZE:
+                search_cache.pop(next(iter(search_cache)), None)
+            search_cache[key] = result
+    return result
+
+
+def execute_tool(tool_name, tool_input, search_cache=None):
+    """
+    Execute a tool and return the result
+
+    Args:
+        tool_name: Name of the tool to run
+        tool_input: Tool arguments from the tool_use block
+        search_cache: Per-loop dict for caching search_files results
+            (no caching if None)
+    """
     try:
         if tool_name == "read_file":
             file_path = Path(tool_input["file_path"])
             if not file_path.exists():
                 return {"error": f"File not found: {file_path}"}
-            return {"content": file_path.read_text(encoding="utf-8")}
+            offset = tool_input.get("offset")
+            limit = tool_input.get("limit")
+            if not (offset or limit):
+                return {"content": file_path.read_text(encoding="utf-8")}
+            start = max(int(offset or 1) - 1, 0)
+            stop = start + int(limit) if limit else None
+            with file_path.open(encoding="utf-8") as fh:
+                return {"content": "".join(itertools.islice(fh, start, stop))}
 
         elif tool_name == "write_file":
+            if search_cache is not None:
+                with _search_cache_lock:
+                    search_cache.clear()
             file_path = Path(tool_input["file_path"])
             file_path.parent.mkdir(parents=True, exist_ok=True)
             file_path.write_text(tool_input["content"], encoding="utf-8")
             return {"success": True, "file_path": str(file_path)}
 
         elif tool_name == "execute_command":
-            command = tool_input["command"]
+            if search_cache is not None:
+                with _search_cache_lock:
+                    search_cache.clear()
             cwd = tool_input.get("cwd", ".")
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=300
-            )
-            return {
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "exit_code": result.returncode
-            }
+            argv = tool_input.get("argv")
+            if argv:
+                return _run_command(argv, cwd, shell=False)
+            if "command" not in tool_input:
+                return {"error": "execute_command requires 'command' or 'argv'"}
+            command = tool_input["command"]
+            argv = _split_command(command)
+            if argv:
+                try:
+                    return _run_command(argv, cwd, shell=False)
+                except OSError:
+                    # Not directly executable: a shell builtin, a script without
+                    # a shebang, a file without execute permission, ... The shell
+                    # runs it or reports it the way it used to (e.g. exit code 126)
+                    pass
+            return _run_command(command, cwd, shell=True)
 
         elif tool_name == "list_directory":
             path = Path(tool_input.get("path", "."))
             if not path.exists():
                 return {"error": f"Path not found: {path}"}
+            # scandir takes the entry type from readdir, avoiding a stat per entry
             items = []
-            for item in path.iterdir():
-                items.append({
-                    "name": item.name,
-                    "type": "directory" if item.is_dir() else "file"
-                })
-            return {"items": items}
+            truncated = False
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if len(items) >= LIST_MAX_ENTRIES:
+                        truncated = True
+                        break
+                    items.append({
+                        "name": entry.name,
+                        "type": "directory" if entry.is_dir() else "file"
+                    })
+            return {"items": items, "truncated": truncated}
 
         elif tool_name == "search_files":
             pattern = tool_input["pattern"]
             search_path = tool_input.get("path", ".")
-            result = subprocess.run(
-                ["rg", "--json", pattern, search_path],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=60
-            )
-            return {
-                "output": result.stdout,
-                "exit_code": result.returncode
-            }
+            if search_cache is None:
+                return _search_files(pattern, search_path)
+            return _cached_search_files(pattern, search_path, search_cache)
 
         else:
             return {"error": f"Unknown tool: {tool_name}"}
@@ -194,7 +389,49 @@ def execute_tool(tool_name, tool_input):
         return {"error": str(e)}
 
 
-def run_tool_loop(client, model, system_prompt, user_message, max_iterations=25, stderr_path=None):
+# Tools without side effects; a turn made up only of these runs concurrently
+READ_ONLY_TOOLS = frozenset(("read_file", "list_directory", "search_files"))
+MAX_TOOL_WORKERS = 8
+
+
+def execute_tools(tool_use_blocks, search_cache=None):
+    """
+    Execute the tool_use blocks of one assistant turn.
+
+    Tools are I/O bound (disk reads, subprocesses), so when every call in the
+    turn is read-only they run on a thread pool. Turns containing a write or
+    command run sequentially so their side effects keep the order Claude chose.
+    search_cache is passed on to execute_tool.
+
+    Returns:
+        list: Tool results, in the same order as tool_use_blocks
+    """
+    if len(tool_use_blocks) < 2 or any(b.name not in READ_ONLY_TOOLS for b in tool_use_blocks):
+        return [execute_tool(b.name, b.input, search_cache) for b in tool_use_blocks]
+
+    workers = min(len(tool_use_blocks), MAX_TOOL_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda b: execute_tool(b.name, b.input, search_cache), tool_use_blocks))
+
+
+def _input_tokens(usage):
+    """
+    Count all input tokens of one API response.
+
+    With prompt caching, usage.input_tokens only covers the tokens after the
+    last cache breakpoint; the cached prefix is reported separately as cache
+    reads and cache writes. Older SDKs lack those fields.
+    """
+    return (
+        usage.input_tokens
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0)
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0)
+    )
+
+
+def run_tool_loop(
+    client, model, system_prompt, user_message, max_iterations=25, stderr_path=None, log_fh=None
+):
     """
     Run the agent tool use loop.
 
@@ -204,7 +441,10 @@ def run_tool_loop(client, model, system_prompt, user_message, max_iterations=25,
         system_prompt: System prompt
         user_message: Initial user message
         max_iterations: Maximum number of iterations
-        stderr_path: Path to write conversation log (stderr.txt)
+        stderr_path: Path to write conversation log (stderr.txt). The log is
+            streamed to disk as the loop runs, so it can be tailed.
+        log_fh: Already open text file to write the log to instead of
+            stderr_path
 
     Returns:
         dict: Result with keys:
@@ -214,7 +454,18 @@ def run_tool_loop(client, model, system_prompt, user_message, max_iterations=25,
             - error: Error message (if failed)
             - performance_metrics: Token usage statistics
     """
-    messages = [{"role": "user", "content": user_message}]
+    if log_fh is not None or not stderr_path:
+        return _run_tool_loop(client, model, system_prompt, user_message, max_iterations, log_fh)
+
+    # Line-buffered so each log line reaches disk as soon as it is written
+    with open(stderr_path, "w", encoding="utf-8", buffering=1) as log_fh:
+        return _run_tool_loop(client, model, system_prompt, user_message, max_iterations, log_fh)
+
+
+def _run_tool_loop(client, model, system_prompt, user_message, max_iterations, log_fh):
+    """Body of run_tool_loop; writes the conversation log to log_fh if given."""
+    search_cache = {}
+    messages = [{"role": "user", "content": [{"type": "text", "text": user_message}]}]
     tool_results = []
 
     # Initialize token counters
@@ -222,48 +473,63 @@ def run_tool_loop(client, model, system_prompt, user_message, max_iterations=25,
     total_output_tokens = 0
     api_calls_count = 0
 
-    # Initialize conversation log for stderr
-    conversation_log = []
+    # Tools and system prompt are identical on every turn; mark the end of
+    # that prefix for prompt caching so later iterations read it from cache.
+    system_blocks = [{
+        "type": "text",
+        "text": system_prompt,
+        "cache_control": {"type": "ephemeral"},
+    }]
+
+    # A second breakpoint sits on the newest user block and moves forward each
+    # turn, so the conversation so far is also served from the cache.
+    cache_block = messages[0]["content"][-1]
+    cache_block["cache_control"] = {"type": "ephemeral"}
 
     for iteration in range(max_iterations):
         try:
             response = client.messages.create(
                 model=model,
-                system=system_prompt,
+                system=system_blocks,
                 messages=messages,
-                max_tokens=4096,
-                tools=TOOLS
+                max_tokens=MAX_TOKENS,
+                tools=API_TOOLS
             )
             api_calls_count += 1
 
             # Collect token usage
-            if hasattr(response, 'usage') and response.usage:
-                total_input_tokens += response.usage.input_tokens
-                total_output_tokens += response.usage.output_tokens
+            usage = getattr(response, 'usage', None)
+            if usage:
+                total_input_tokens += _input_tokens(usage)
+                total_output_tokens += usage.output_tokens
 
             # Log assistant response to stderr
-            if stderr_path:
-                conversation_log.append(f"\n{'='*60}\n")
-                conversation_log.append(f"Iteration {iteration + 1}\n")
-                conversation_log.append(f"Model: {model}\n")
-                conversation_log.append(f"Input Tokens: {response.usage.input_tokens if hasattr(response, 'usage') and response.usage else 'N/A'}\n")
-                conversation_log.append(f"Output Tokens: {response.usage.output_tokens if hasattr(response, 'usage') and response.usage else 'N/A'}\n")
-                conversation_log.append(f"\n--- Assistant Response ---\n")
+            if log_fh:
+                log_fh.write(f"\n{'='*60}\n")
+                log_fh.write(f"Iteration {iteration + 1}\n")
+                log_fh.write(f"Model: {model}\n")
+                if usage:
+                    log_fh.write(
+                        f"Input Tokens: {_input_tokens(usage)} "
+                        f"(cache read: {getattr(usage, 'cache_read_input_tokens', 0) or 0}, "
+                        f"cache write: {getattr(usage, 'cache_creation_input_tokens', 0) or 0})\n"
+                    )
+                    log_fh.write(f"Output Tokens: {usage.output_tokens}\n")
+                else:
+                    log_fh.write("Input Tokens: N/A\n")
+                    log_fh.write("Output Tokens: N/A\n")
+                log_fh.write(f"\n--- Assistant Response ---\n")
 
                 for block in response.content:
                     if block.type == "text":
-                        conversation_log.append(f"{block.text}\n")
+                        log_fh.write(f"{block.text}\n")
                     elif block.type == "tool_use":
-                        conversation_log.append(f"\n[Tool Call: {block.name}]\n")
-                        conversation_log.append(f"Input: {json.dumps(block.input, ensure_ascii=False, indent=2)}\n")
+                        log_fh.write(f"\n[Tool Call: {block.name}]\n")
+                        log_fh.write(f"Input: {dump_json(block.input, indent=True)}\n")
 
         except Exception as e:
-            # Write conversation log to stderr even on error
-            if stderr_path:
-                from pathlib import Path
-                conversation_log.append(f"\n!!! ERROR: {e} !!!\n")
-                stderr_content = "".join(conversation_log)
-                Path(stderr_path).write_text(stderr_content, encoding="utf-8")
+            if log_fh:
+                log_fh.write(f"\n!!! ERROR: {e} !!!\n")
 
             return {
                 "status": "failed",
@@ -285,12 +551,6 @@ def run_tool_loop(client, model, system_prompt, user_message, max_iterations=25,
                 if block.type == "text":
                     final_text += block.text
 
-            # Write conversation log to stderr
-            if stderr_path:
-                from pathlib import Path
-                stderr_content = "".join(conversation_log)
-                Path(stderr_path).write_text(stderr_content, encoding="utf-8")
-
             return {
                 "status": "success",
                 "summary": final_text,
@@ -306,6 +566,7 @@ def run_tool_loop(client, model, system_prompt, user_message, max_iterations=25,
         # Process tool calls
         assistant_message = {"role": "assistant", "content": []}
         user_message_blocks = []
+        tool_use_blocks = []
 
         for block in response.content:
             if block.type == "text":
@@ -317,44 +578,46 @@ def run_tool_loop(client, model, system_prompt, user_message, max_iterations=25,
                     "name": block.name,
                     "input": block.input
                 })
-
-                # Execute the tool
-                tool_result = execute_tool(block.name, block.input)
-                tool_results.append({
-                    "tool": block.name,
-                    "input": block.input,
-                    "result": tool_result
-                })
-
-                # Log tool result to stderr
-                if stderr_path:
-                    conversation_log.append(f"\n[Tool Result: {block.name}]\n")
-                    if "error" in tool_result:
-                        conversation_log.append(f"Error: {tool_result['error']}\n")
-                    else:
-                        conversation_log.append(f"{json.dumps(tool_result, ensure_ascii=False, indent=2)}\n")
-
-                # Format result for Claude
-                if "error" in tool_result:
-                    result_text = f"Error: {tool_result['error']}"
-                else:
-                    result_text = json.dumps(tool_result, ensure_ascii=False)
-
-                user_message_blocks.append({
-                    "type": "tool_result",
-                    "tool_use_id": block.id,
-                    "content": result_text
-                })
+                tool_use_blocks.append(block)
+
+        # Execute the tools (concurrently when safe), results kept in call order
+        for block, tool_result in zip(tool_use_blocks, execute_tools(tool_use_blocks, search_cache)):
+            tool_results.append({
+                "tool": block.name,
+                "input": block.input,
+                "result": tool_result
+            })
+
+            # Format result for Claude (serialized once, reused for the log)
+            if "error" in tool_result:
+                result_text = f"Error: {tool_result['error']}"
+            else:
+                result_text = dump_json(tool_result)
+            if len(result_text) > MAX_TOOL_RESULT_CHARS:
+                dropped = len(result_text) - MAX_TOOL_RESULT_CHARS
+                result_text = f"{result_text[:MAX_TOOL_RESULT_CHARS]}\n...[truncated {dropped} characters]"
+
+            # Log tool result to stderr
+            if log_fh:
+                log_fh.write(f"\n[Tool Result: {block.name}]\n")
+                log_fh.write(f"{result_text}\n")
+
+            user_message_blocks.append({
+                "type": "tool_result",
+                "tool_use_id": block.id,
+                "content": result_text
+            })
 
         messages.append(assistant_message)
         messages.append({"role": "user", "content": user_message_blocks})
 
-    # Write conversation log to stderr when max iterations reached
-    if stderr_path:
-        from pathlib import Path
-        conversation_log.append(f"\n!!! WARNING: Maximum iterations ({max_iterations}) reached !!!\n")
-        stderr_content = "".join(conversation_log)
-        Path(stderr_path).write_text(stderr_content, encoding="utf-8")
+        if user_message_blocks:
+            del cache_block["cache_control"]
+            cache_block = user_message_blocks[-1]
+            cache_block["cache_control"] = {"type": "ephemeral"}
+
+    if log_fh:
+        log_fh.write(f"\n!!! WARNING: Maximum iterations ({max_iterations}) reached !!!\n")
 
     return {
         "status": "partial",
@@ -369,16 +632,38 @@ def run_tool_loop(client, model, system_prompt, user_message, max_iterations=25,
     }
 
 
+@functools.lru_cache(maxsize=4)
+def get_client(api_key):
+    """
+    Return a shared Anthropic client for api_key.
+
+    The client owns an HTTP connection pool, so reusing it across subagent
+    runs in the same process keeps connections alive and skips a new TLS
+    handshake per run.
+    """
+    try:
+        import anthropic
+    except ImportError:
+        raise SystemExit("anthropic package not installed. Run: pip install anthropic")
+    return anthropic.Anthropic(api_key=api_key)
+
+
 def execute_subagent_claude(
     request_path,
     response_path,
     prompt_file=".agent/docs/subagent_prompt.md",
     api_key=None,
     model="claude-sonnet-4-5-20250929",
-    cwd="."
+    cwd=".",
+    request_obj=None,
 ):
-    """Execute Subagent using Claude API with Tool Use"""
-    import os
+    """
+    Execute Subagent using Claude API with Tool Use.
+
+    request_obj may be passed when the caller has already parsed
+    request.json (e.g. while validating it); otherwise it is read from
+    request_path.
+    """
     request_path = Path(request_path)
     response_path = Path(response_path)
 
@@ -388,48 +673,39 @@ def execute_subagent_claude(
     if not api_key:
         raise SystemExit("ANTHROPIC_API_KEY not set. Provide --api-key or set environment variable.")
 
-    # Validate request file exists
-    if not request_path.exists():
-        raise SystemExit(f"Request file not found: {request_path}")
-
-    # Load request JSON
-    request_raw = request_path.read_text(encoding="utf-8-sig")
-    try:
-        request_obj = json.loads(request_raw)
-    except json.JSONDecodeError:
-        raise SystemExit(f"Request JSON is invalid: {request_path}")
+    # Load request JSON unless the caller already has it
+    if request_obj is None:
+        try:
+            request_obj = load_json_file(request_path)
+        except FileNotFoundError:
+            raise SystemExit(f"Request file not found: {request_path}")
+        except ValueError:
+            raise SystemExit(f"Request JSON is invalid: {request_path}")
 
     # Setup paths and record start time
     output_dir = response_path.parent
     stderr_path = output_dir / "stderr.txt"
-    started_at = datetime.now(timezone.utc).isoformat()
-
-    # Initialize stderr file
-    stderr_path.write_text("", encoding="utf-8")
-
-    # Write initial info file
-    write_info_file(
-        output_dir=output_dir,
-        engine="claude",
-        model=model,
-        started_at=started_at,
-        pid=os.getpid(),
-        working_directory=cwd,
-    )
-
-    # Build prompt
-    base_prompt = load_prompt(prompt_file)
-    user_message = build_prompt(base_prompt, request_obj)
+    started_at = datetime.now(timezone.utc)
+    start_mono = time.monotonic()
+
+    # stderr.txt is opened (and truncated) and a previous run's info.json
+    # removed before anything else can fail, so an early exit (missing
+    # prompt file, anthropic not installed) cannot leave the previous run's
+    # files behind. info.json is written once, after the loop.
+    # Line-buffered so each log line reaches disk as soon as it is written
+    with open(stderr_path, "w", encoding="utf-8", buffering=1) as log_fh:
+        try:
+            (output_dir / "info.json").unlink()
+        except FileNotFoundError:
+            pass
 
-    # Import anthropic
-    try:
-        import anthropic
-    except ImportError:
-        raise SystemExit("anthropic package not installed. Run: pip install anthropic")
+        # Build prompt
+        base_prompt = load_prompt(prompt_file)
+        user_message = build_prompt(base_prompt, request_obj)
 
-    # Run agent loop
-    client = anthropic.Anthropic(api_key=api_key)
-    result = run_tool_loop(client, model, base_prompt, user_message, stderr_path=str(stderr_path))
+        # Run agent loop
+        client = get_client(api_key)
+        result = run_tool_loop(client, model, base_prompt, user_message, log_fh=log_fh)
 
     # Build response
     response_obj = {
@@ -445,9 +721,9 @@ def execute_subagent_claude(
         response_obj["issues"] = [result["error"]]
 
     # Write response
-    response_path.write_text(json.dumps(response_obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_file_bytes(response_path, dump_json_bytes(response_obj, indent=True))
 
-    # Update info.json with final exit code and performance metrics
+    # Write info.json with final exit code and performance metrics
     exit_code = 0 if result.get("status") == "success" else 1
     performance_metrics = result.get("performance_metrics", {
         "total_tokens": None,
@@ -465,6 +741,7 @@ def execute_subagent_claude(
         exit_code=exit_code,
         working_directory=cwd,
         performance_metrics=performance_metrics,
+        duration_seconds=time.monotonic() - start_mono,
     )
 
     return exit_code
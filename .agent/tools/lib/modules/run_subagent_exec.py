@@ -6,64 +6,55 @@ This script handles the actual execution of the Subagent using Codex CLI,
 including process management, stream handling, and timeout monitoring.
 """
 import argparse
+import os
+import selectors
+import shutil
+import signal
 import subprocess
 import sys
 import threading
 import time
+from datetime import datetime, timezone
 from pathlib import Path
+from queue import Empty, Queue
 
 # Import utility functions
 try:
-    from .lib import (
+    from .. import (
         default_codex_cmd,
+        load_json_file,
         load_prompt,
-        build_prompt,
+        write_prompt,
         write_info_file,
         write_fallback_response,
     )
 except ImportError:
-    # Fallback implementations when run as standalone script
-    import json
-    from datetime import datetime, timezone
-
-    def default_codex_cmd():
-        return "codex.cmd" if sys.platform.startswith("win") else "codex"
-
-    def load_prompt(path):
-        prompt_path = Path(path)
-        if not prompt_path.exists():
-            raise SystemExit(f"Prompt file not found: {prompt_path}")
-        return prompt_path.read_text(encoding="utf-8-sig").strip()
-
-    def build_prompt(base_prompt, request_obj):
-        import json
-        request_json = json.dumps(request_obj, ensure_ascii=True, indent=2)
-        return (
-            f"{base_prompt}\n\n"
-            "Request JSON:\n"
-            "```json\n"
-            f"{request_json}\n"
-            "```"
-        )
+    # Run as a standalone script: import the same helpers from lib
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from lib import (
+        default_codex_cmd,
+        load_json_file,
+        load_prompt,
+        write_prompt,
+        write_info_file,
+        write_fallback_response,
+    )
+
 
-    def write_fallback_response(response_path, task_id, summary, issues):
-        import json
-        payload = {
-            "version": "1.0",
-            "task_id": task_id or "",
-            "status": "failed",
-            "summary": summary,
-            "outputs": [],
-            "issues": issues if issues else [],
-        }
-        response_path.write_text(json.dumps(payload, ensure_ascii=True, indent=2), encoding="utf-8")
+# Bytes of trailing stderr kept in memory for the exit-code warning
+STDERR_TAIL_BYTES = 4096
+
+# Buffer size for the Codex pipes; matches the default Linux pipe capacity,
+# so the prompt pieces written by write_prompt() coalesce into few writes
+PIPE_BUFFER_SIZE = 64 * 1024
 
 
 def read_stream(stream, out_queue):
-    """Read from a stream and put chunks into a queue."""
+    """Read from a binary stream and put chunks into a queue."""
     try:
         while True:
-            chunk = stream.read(1024)
+            # read1 returns as soon as any data is available
+            chunk = stream.read1(65536)
             if not chunk:
                 break
             out_queue.put(chunk)
@@ -71,6 +62,196 @@ def read_stream(stream, out_queue):
         out_queue.put(None)
 
 
+def _kill_process_tree(proc):
+    """
+    Kill proc together with the processes it started.
+
+    Codex runs in its own process group (see execute_subagent), so its
+    Node subprocesses and MCP servers can be killed along with it instead
+    of being left running after a timeout.
+    """
+    if sys.platform.startswith("win"):
+        # Reaches the rest of the console process group; kill() then
+        # terminates Codex itself
+        try:
+            proc.send_signal(signal.CTRL_BREAK_EVENT)
+        except OSError:
+            pass
+        proc.kill()
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        # Group already gone; make sure the leader is not left behind
+        proc.kill()
+
+
+# Codex processes started by execute_subagent and not yet reaped
+_running_procs = set()
+_running_procs_lock = threading.Lock()
+
+
+def kill_running_subagents():
+    """
+    Kill the process tree of every Codex run still in progress.
+
+    Codex runs in its own session, so a Ctrl-C or SIGTERM aimed at this
+    process never reaches it, and only the thread that gets the interrupt
+    cleans up its own run. Callers running execute_subagent in worker
+    threads (e.g. --batch) call this when they are interrupted; the
+    affected runs then finish as failed.
+    """
+    with _running_procs_lock:
+        procs = list(_running_procs)
+    for proc in procs:
+        _kill_process_tree(proc)
+
+
+def _exit_on_sigterm(signum, frame):
+    """SIGTERM handler: unwind like Ctrl-C, so running Codex processes are killed too."""
+    raise SystemExit(128 + signum)
+
+
+def _monitor_selector(proc, idle_timeout, stderr_fp, overall_deadline=None):
+    """
+    Drain proc's stderr with a selector until it reaches EOF.
+
+    Blocks in select() until the pipe is readable or the next deadline
+    passes, so a quiet process costs no wakeups. stderr bytes are written
+    to stderr_fp (a binary file) as they arrive. The process is killed if
+    stderr stays silent for idle_timeout seconds, or once time.monotonic()
+    reaches overall_deadline (if given).
+
+    Returns:
+        tuple: (stderr_tail, timed_out) where stderr_tail is a bytearray
+            with the last STDERR_TAIL_BYTES bytes of stderr and timed_out is None,
+            "idle" or "overall"
+    """
+    stderr_tail = bytearray()
+    # Absolute time at which stderr silence becomes a timeout; pushed back
+    # on every stderr read and handed to select() as its timeout
+    deadline = time.monotonic() + idle_timeout
+    timed_out = None
+
+    with selectors.DefaultSelector() as sel:
+        os.set_blocking(proc.stderr.fileno(), False)
+        sel.register(proc.stderr, selectors.EVENT_READ)
+
+        while sel.get_map():
+            now = time.monotonic()
+            if overall_deadline is not None and now >= overall_deadline:
+                timed_out = "overall"
+                _kill_process_tree(proc)
+                break
+            remaining = deadline - now
+            if remaining <= 0:
+                timed_out = "idle"
+                _kill_process_tree(proc)
+                break
+            if overall_deadline is not None:
+                remaining = min(remaining, overall_deadline - now)
+
+            for key, _ in sel.select(remaining):
+                try:
+                    data = os.read(key.fd, 65536)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    sel.unregister(key.fileobj)
+                    continue
+                # Raw bytes go straight to the file; only the tail is kept
+                stderr_fp.write(data)
+                stderr_tail += data
+                del stderr_tail[:-STDERR_TAIL_BYTES]
+                deadline = time.monotonic() + idle_timeout
+
+    return stderr_tail, timed_out
+
+
+def _monitor_threaded(proc, idle_timeout, stderr_fp, overall_deadline=None):
+    """
+    Drain proc's stderr with a reader thread until it reaches EOF.
+
+    Used on Windows, where select() does not work on pipes. Like
+    _monitor_selector(), it sleeps until stderr data arrives or the next
+    deadline passes. stderr is written to stderr_fp as it arrives, and
+    timeouts behave as in _monitor_selector().
+
+    Returns:
+        tuple: (stderr_tail, timed_out)
+    """
+    stderr_queue = Queue()
+    stderr_tail = bytearray()
+
+    threading.Thread(target=read_stream, args=(proc.stderr, stderr_queue), daemon=True).start()
+
+    deadline = time.monotonic() + idle_timeout
+    timed_out = None
+
+    # Monitor process: block on the queue until data arrives or the next
+    # deadline passes, rather than waking on a fixed tick
+    while True:
+        now = time.monotonic()
+        if overall_deadline is not None and now >= overall_deadline:
+            timed_out = "overall"
+            _kill_process_tree(proc)
+            break
+        remaining = deadline - now
+        if remaining <= 0:
+            timed_out = "idle"
+            _kill_process_tree(proc)
+            break
+        if overall_deadline is not None:
+            remaining = min(remaining, overall_deadline - now)
+
+        try:
+            item = stderr_queue.get(timeout=remaining)
+        except Empty:
+            continue
+        if item is None:
+            break
+        stderr_fp.write(item)
+        stderr_tail += item
+        del stderr_tail[:-STDERR_TAIL_BYTES]
+        deadline = time.monotonic() + idle_timeout
+
+    return stderr_tail, timed_out
+
+
+def _limit_prefix(nice=None, cpus=None):
+    """
+    Build a command prefix that lowers Codex's priority and/or pins it to some CPUs.
+
+    The nice and taskset commands apply the settings before Codex starts,
+    so every thread and process it creates inherits them. Setting them
+    from the parent after spawning would only reach the main thread, and
+    preexec_fn is unsafe while other threads run (as in --batch).
+
+    Args:
+        nice: Niceness increment, as for the nice command (POSIX only)
+        cpus: Iterable of CPU numbers to restrict Codex to (Linux only)
+
+    Returns:
+        list: Command prefix, empty if nothing applies
+    """
+    prefix = []
+    if nice:
+        nice_cmd = None if sys.platform.startswith("win") else shutil.which("nice")
+        if nice_cmd:
+            prefix += [nice_cmd, "-n", str(nice)]
+        else:
+            print("Warning: --child-nice ignored, nice command not available", file=sys.stderr)
+
+    if cpus:
+        taskset_cmd = shutil.which("taskset") if sys.platform.startswith("linux") else None
+        if taskset_cmd:
+            prefix += [taskset_cmd, "-c", ",".join(str(cpu) for cpu in cpus)]
+        else:
+            print("Warning: --child-cpus ignored, taskset command not available", file=sys.stderr)
+
+    return prefix
+
+
 def execute_subagent(
     request_path,
     response_path,
@@ -82,6 +263,10 @@ def execute_subagent(
     skip_git_repo_check=False,
     idle_timeout=60,
     codex_args=None,
+    request_obj=None,
+    overall_timeout=None,
+    child_nice=None,
+    child_cpus=None,
 ):
     """
     Execute Subagent via Codex CLI.
@@ -97,46 +282,64 @@ def execute_subagent(
         skip_git_repo_check: Skip git repository check
         idle_timeout: Timeout in seconds if no stderr output
         codex_args: Additional arguments for codex exec
+        request_obj: Already parsed request.json (e.g. from
+            validate_request_file); read from request_path when None
+        overall_timeout: Wall-clock limit in seconds for the whole Codex
+            run, regardless of output (default: no limit)
+        child_nice: Niceness increment for the Codex process (POSIX only)
+        child_cpus: CPU numbers to pin the Codex process to (Linux only)
 
     Returns:
-        int: Exit code (0 for success, non-zero for failure)
+        tuple: (exit_code, response_obj) where exit_code is 0 for success and
+            non-zero for failure, and response_obj is the parsed response.json
+            written by Codex (None if a fallback response was written instead)
     """
-    import os
     request_path = Path(request_path)
     response_path = Path(response_path)
 
-    # Validate request file exists
-    if not request_path.exists():
-        raise SystemExit(f"Request file not found: {request_path}")
-
-    # Load request JSON
-    import json
-    request_raw = request_path.read_text(encoding="utf-8-sig")
-    try:
-        request_obj = json.loads(request_raw)
-    except json.JSONDecodeError:
-        raise SystemExit(f"Request JSON is invalid: {request_path}")
+    # Load request JSON unless the caller already has it
+    if request_obj is None:
+        try:
+            request_obj = load_json_file(request_path)
+        except FileNotFoundError:
+            raise SystemExit(f"Request file not found: {request_path}")
+        except ValueError:
+            raise SystemExit(f"Request JSON is invalid: {request_path}")
 
     # Setup paths and record start time
     output_dir = response_path.parent
     stderr_path = output_dir / "stderr.txt"
-    started_at = datetime.now(timezone.utc).isoformat()
-
-    # Write initial info file and initialize stderr
-    write_info_file(
-        output_dir=output_dir,
-        engine="codex",
-        model=profile,
-        started_at=started_at,
-        pid=os.getpid(),
-        working_directory=cd,
-        command_args=["--idle-timeout", str(idle_timeout)] + (["--sandbox", sandbox] if sandbox else []),
-    )
-    stderr_path.write_text("", encoding="utf-8")
+    started_at = datetime.now(timezone.utc)
+    start_mono = time.monotonic()
+
+    # Write initial info file
+    pid = os.getpid()
+    command_args = ["--idle-timeout", str(idle_timeout)] + (["--sandbox", sandbox] if sandbox else [])
+    if overall_timeout is not None:
+        command_args += ["--overall-timeout", str(overall_timeout)]
+    if child_nice:
+        command_args += ["--child-nice", str(child_nice)]
+    if child_cpus:
+        command_args += ["--child-cpus"] + [str(cpu) for cpu in child_cpus]
+
+    def emit_info(exit_code=None):
+        """Write info.json; once an exit code is known, also record the elapsed time."""
+        write_info_file(
+            output_dir=output_dir,
+            engine="codex",
+            model=profile,
+            started_at=started_at,
+            pid=pid,
+            exit_code=exit_code,
+            duration_seconds=None if exit_code is None else time.monotonic() - start_mono,
+            working_directory=cd,
+            command_args=command_args,
+        )
+
+    emit_info()
 
-    # Build prompt
+    # Load base prompt
     base_prompt = load_prompt(prompt_file)
-    prompt = build_prompt(base_prompt, request_obj)
 
     # Build Codex command
     if codex_cmd is None:
@@ -155,109 +358,101 @@ def execute_subagent(
     if codex_args:
         cmd += codex_args
     cmd.append("-")
+    if child_nice or child_cpus:
+        cmd = _limit_prefix(child_nice, child_cpus) + cmd
+
+    # Run Codex in a process group of its own so a timeout can kill
+    # everything it started, not just the top-level process
+    if sys.platform.startswith("win"):
+        popen_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        popen_kwargs = {"start_new_session": True}
+
+    # stderr.txt is opened (and truncated) before spawning, so a failed
+    # start cannot leave the previous run's stderr next to this info.json.
+    # stderr goes straight to it as it arrives
+    with stderr_path.open("wb") as stderr_fp:
+        # Start process. stdout is discarded: the response is written by Codex
+        # to response_path via --output-last-message
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            bufsize=PIPE_BUFFER_SIZE,
+            **popen_kwargs,
+        )
+        # Registered until reaped, so kill_running_subagents() can reach it
+        # from another thread
+        with _running_procs_lock:
+            _running_procs.add(proc)
+        try:
+            # Send prompt, streamed piece by piece rather than built as one string
+            write_prompt(proc.stdin, base_prompt, request_obj)
+            proc.stdin.close()
 
-    # Start process
-    proc = subprocess.Popen(
-        cmd,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-    )
-
-    # Send prompt
-    try:
-        proc.stdin.write(prompt)
-        proc.stdin.close()
-    except Exception:
-        proc.kill()
-        raise
-
-    # Stream handling
-    from queue import Empty, Queue
-    stdout_queue = Queue()
-    stderr_queue = Queue()
-    stdout_chunks = []
-    stderr_chunks = []
-
-    threading.Thread(target=read_stream, args=(proc.stdout, stdout_queue), daemon=True).start()
-    threading.Thread(target=read_stream, args=(proc.stderr, stderr_queue), daemon=True).start()
-
-    last_output = time.monotonic()
-    stdout_done = False
-    stderr_done = False
-    timed_out = False
+            overall_deadline = None
+            if overall_timeout is not None:
+                overall_deadline = time.monotonic() + overall_timeout
 
-    # Monitor process
-    while True:
-        try:
-            item = stdout_queue.get(timeout=0.1)
-            if item is None:
-                stdout_done = True
+            if sys.platform.startswith("win"):
+                monitor = _monitor_threaded
             else:
-                stdout_chunks.append(item)
-        except Empty:
-            pass
+                monitor = _monitor_selector
+            stderr_tail, timed_out = monitor(proc, idle_timeout, stderr_fp, overall_deadline)
 
-        try:
-            item = stderr_queue.get_nowait()
-            if item is None:
-                stderr_done = True
+            if overall_deadline is None or timed_out:
+                proc.wait()
             else:
-                stderr_chunks.append(item)
-                last_output = time.monotonic()
-        except Empty:
-            pass
-
-        if stdout_done and stderr_done:
-            break
-
-        if time.monotonic() - last_output > idle_timeout:
-            timed_out = True
-            proc.kill()
-            break
-
-    proc.wait()
-
-    # Write stderr
-    stderr_text = "".join(stderr_chunks)
-    if timed_out:
-        stderr_text = (stderr_text + "" if stderr_text else "") + f"Terminated after {idle_timeout}s of no output."
-    stderr_path.write_text(stderr_text, encoding="utf-8")
+                # stderr closed, but Codex may still be running
+                try:
+                    proc.wait(timeout=max(0, overall_deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    _kill_process_tree(proc)
+                    proc.wait()
+                    timed_out = "overall"
+        except BaseException:
+            # A failed prompt write, or an interrupt: in its own session
+            # Codex no longer gets the terminal's Ctrl-C, so take it down
+            if proc.poll() is None:
+                _kill_process_tree(proc)
+                proc.wait()
+            raise
+        finally:
+            with _running_procs_lock:
+                _running_procs.discard(proc)
+
+        if timed_out == "idle":
+            stderr_fp.write(f"\nTerminated after {idle_timeout}s of no output.\n".encode("utf-8"))
+        elif timed_out == "overall":
+            stderr_fp.write(f"\nTerminated after {overall_timeout}s overall timeout.\n".encode("utf-8"))
 
     # Handle timeout
     if timed_out:
-        write_fallback_response(
-            response_path,
-            request_obj.get("task_id"),
-            f"Subagent timed out after {idle_timeout}s of no stderr output",
-            ["timeout", f"no stderr output for {idle_timeout}s"],
-        )
+        if timed_out == "idle":
+            summary = f"Subagent timed out after {idle_timeout}s of no stderr output"
+            issues = ["timeout", f"no stderr output for {idle_timeout}s"]
+        else:
+            summary = f"Subagent timed out after {overall_timeout}s"
+            issues = ["timeout", f"overall timeout of {overall_timeout}s exceeded"]
+        write_fallback_response(response_path, request_obj.get("task_id"), summary, issues)
         # Update info.json with timeout error
-        write_info_file(
-            output_dir=output_dir,
-            engine="codex",
-            model=profile,
-            started_at=started_at,
-            pid=os.getpid(),
-            exit_code=1,
-            working_directory=cd,
-            command_args=["--idle-timeout", str(idle_timeout)] + (["--sandbox", sandbox] if sandbox else []),
-        )
-        return 1
+        emit_info(1)
+        return 1, None
 
     # Handle non-zero exit code
-    if proc.returncode != 0 and stderr_text.strip():
+    # The tail is only decoded here; it may start mid-character
+    stderr_text = stderr_tail.decode("utf-8", errors="replace").strip()
+    if proc.returncode != 0 and stderr_text:
         print(
-            f"Warning: Codex exited with code {proc.returncode}. stderr: {stderr_text.strip()}",
+            f"Warning: Codex exited with code {proc.returncode}. stderr: {stderr_text}",
             file=sys.stderr,
         )
 
-    # Verify response file exists and is valid JSON
+    # Verify response file exists and is valid JSON (parsed straight from
+    # bytes, skipping a UTF-8 BOM if present)
     try:
-        raw_response = response_path.read_text(encoding="utf-8-sig")
+        response_obj = load_json_file(response_path)
     except FileNotFoundError:
         write_fallback_response(
             response_path,
@@ -266,21 +461,10 @@ def execute_subagent(
             ["missing response.json", f"exit code: {proc.returncode}"],
         )
         # Update info.json with exit code
-        write_info_file(
-            output_dir=output_dir,
-            engine="codex",
-            model=profile,
-            started_at=started_at,
-            pid=os.getpid(),
-            exit_code=1,
-            working_directory=cd,
-            command_args=["--idle-timeout", str(idle_timeout)] + (["--sandbox", sandbox] if sandbox else []),
-        )
-        return 1
-
-    try:
-        json.loads(raw_response)
-    except json.JSONDecodeError:
+        emit_info(1)
+        return 1, None
+    except ValueError:
+        # JSONDecodeError, or UnicodeDecodeError for non-UTF-8 output
         write_fallback_response(
             response_path,
             request_obj.get("task_id"),
@@ -288,31 +472,13 @@ def execute_subagent(
             ["invalid json response", f"exit code: {proc.returncode}"],
         )
         # Update info.json with exit code
-        write_info_file(
-            output_dir=output_dir,
-            engine="codex",
-            model=profile,
-            started_at=started_at,
-            pid=os.getpid(),
-            exit_code=1,
-            working_directory=cd,
-            command_args=["--idle-timeout", str(idle_timeout)] + (["--sandbox", sandbox] if sandbox else []),
-        )
-        return 1
+        emit_info(1)
+        return 1, None
 
     # Update info.json with final exit code
-    write_info_file(
-        output_dir=output_dir,
-        engine="codex",
-        model=profile,
-        started_at=started_at,
-        pid=os.getpid(),
-        exit_code=proc.returncode,
-        working_directory=cd,
-        command_args=["--idle-timeout", str(idle_timeout)] + (["--sandbox", sandbox] if sandbox else []),
-    )
+    emit_info(proc.returncode)
 
-    return proc.returncode
+    return proc.returncode, response_obj
 
 
 def main():
@@ -333,6 +499,26 @@ def main():
     parser.add_argument("--cd", default=".", help="Working directory for Codex exec.")
     parser.add_argument("--skip-git-repo-check", action="store_true", help="Skip git repo check.")
     parser.add_argument("--idle-timeout", type=int, default=60, help="Terminate if stderr is silent for N seconds.")
+    parser.add_argument(
+        "--overall-timeout",
+        type=float,
+        default=None,
+        help="Terminate if Codex runs longer than N seconds in total.",
+    )
+    parser.add_argument(
+        "--child-nice",
+        type=int,
+        default=None,
+        help="Run Codex at this niceness increment, e.g. 5 (POSIX only).",
+    )
+    parser.add_argument(
+        "--child-cpus",
+        type=int,
+        nargs="+",
+        default=None,
+        metavar="CPU",
+        help="Pin Codex to these CPU numbers (Linux only).",
+    )
     parser.add_argument(
         "--codex-args",
         nargs=argparse.REMAINDER,
@@ -341,7 +527,8 @@ def main():
     )
     args = parser.parse_args()
 
-    exit_code = execute_subagent(
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    exit_code, _ = execute_subagent(
         request_path=args.request,
         response_path=args.response,
         prompt_file=args.prompt_file,
@@ -352,6 +539,9 @@ def main():
         skip_git_repo_check=args.skip_git_repo_check,
         idle_timeout=args.idle_timeout,
         codex_args=args.codex_args,
+        overall_timeout=args.overall_timeout,
+        child_nice=args.child_nice,
+        child_cpus=args.child_cpus,
     )
 
     sys.exit(exit_code)
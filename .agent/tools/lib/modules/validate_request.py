@@ -8,27 +8,18 @@ and has all required fields.
 Required fields are dynamically loaded from template_request.json.
 """
 import argparse
-import json
 import sys
 from pathlib import Path
 
-# Import schema loader for dynamic template loading
+# Import shared helpers and the template-driven schema loader
 try:
-    from ..lib.schema_loader import load_request_template
+    from .. import dump_json, load_json_file
+    from ..schema_loader import get_request_fields
 except ImportError:
-    # Fallback if schema_loader is not available
-    def load_request_template():
-        return {
-            "version": "1.0",
-            "task_id": "",
-            "task": "",
-            "context": {
-                "files": [],
-                "notes": ""
-            },
-            "constraints": [],
-            "acceptance_criteria": []
-        }
+    # Run as a standalone script: import the same helpers from lib
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from lib import dump_json, load_json_file
+    from lib.schema_loader import get_request_fields
 
 
 def validate_request_file(request_path):
@@ -47,19 +38,17 @@ def validate_request_file(request_path):
     request_path = Path(request_path)
     errors = []
 
-    # Check file exists
-    if not request_path.exists():
+    # Read and parse JSON straight from bytes
+    try:
+        request_obj = load_json_file(request_path)
+    except FileNotFoundError:
         return {
             "valid": False,
             "errors": [f"Request file not found: {request_path}"],
             "request_obj": None,
         }
-
-    # Read and parse JSON
-    try:
-        request_raw = request_path.read_text(encoding="utf-8-sig")
-        request_obj = json.loads(request_raw)
-    except json.JSONDecodeError as e:
+    except ValueError as e:
+        # JSONDecodeError, or UnicodeDecodeError for non-UTF-8 content
         return {
             "valid": False,
             "errors": [f"Request JSON is invalid: {e}"],
@@ -68,17 +57,15 @@ def validate_request_file(request_path):
 
     # Load template and compare fields
     try:
-        template = load_request_template()
-        template_fields = set(template.keys())
-        actual_fields = set(request_obj.keys())
-
+        template_fields = get_request_fields()
+        # Set operations against the request's key view
         # Check for missing fields
-        missing_fields = template_fields - actual_fields
+        missing_fields = template_fields - request_obj.keys()
         if missing_fields:
             errors.append(f"Request JSON missing fields: {', '.join(sorted(missing_fields))}")
 
         # Check for extra fields
-        extra_fields = actual_fields - template_fields
+        extra_fields = request_obj.keys() - template_fields
         if extra_fields:
             errors.append(f"Request JSON has extra fields not in template: {', '.join(sorted(extra_fields))}")
 
@@ -113,7 +100,7 @@ def main():
             "valid": result["valid"],
             "errors": result["errors"],
         }
-        print(json.dumps(output, ensure_ascii=False, indent=2))
+        print(dump_json(output, indent=True))
     else:
         if result["valid"]:
             print(f"[OK] Request file is valid: {args.request}")
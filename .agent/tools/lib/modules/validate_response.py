@@ -8,30 +8,32 @@ Can also validate against an expected schema or acceptance criteria.
 Required fields are dynamically loaded from template_response.json.
 """
 import argparse
-import json
 import sys
 from pathlib import Path
 
-# Import schema loader for dynamic template loading
+# Import shared helpers and the template-driven schema loader
 try:
-    from ..lib.schema_loader import load_response_template
+    from .. import dump_json, load_json_file
+    from ..schema_loader import get_response_fields
 except ImportError:
-    # Fallback if schema_loader is not available
-    def load_response_template():
-        return {
-            "version": "1.0",
-            "task_id": "",
-            "status": "",
-            "summary": "",
-            "outputs": [],
-            "issues": []
-        }
+    # Run as a standalone script: import the same helpers from lib
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from lib import dump_json, load_json_file
+    from lib.schema_loader import get_response_fields
+
+
+# Allowed values of the response "status" field
+_STATUS_CHOICES = ("success", "partial", "failed")
+_VALID_STATUSES = frozenset(_STATUS_CHOICES)
 
 
 def validate_response_file(response_path, check_required_fields=True):
     """
     Validate response.json file.
 
+    With check_required_fields=False this is a syntax-only check: the file
+    is parsed and the template is never loaded.
+
     Args:
         response_path: Path to response.json file
         check_required_fields: Whether to check for required fields
@@ -43,49 +45,68 @@ def validate_response_file(response_path, check_required_fields=True):
             - response_obj (dict): Parsed response object (None if invalid)
     """
     response_path = Path(response_path)
-    errors = []
 
-    # Check file exists
-    if not response_path.exists():
+    # Read and parse JSON straight from bytes
+    try:
+        response_obj = load_json_file(response_path)
+    except FileNotFoundError:
         return {
             "valid": False,
             "errors": [f"Response file not found: {response_path}"],
             "response_obj": None,
         }
-
-    # Read and parse JSON
-    try:
-        response_raw = response_path.read_text(encoding="utf-8-sig")
-        response_obj = json.loads(response_raw)
-    except json.JSONDecodeError as e:
+    except ValueError as e:
+        # JSONDecodeError, or UnicodeDecodeError for non-UTF-8 content
         return {
             "valid": False,
             "errors": [f"Response JSON is invalid: {e}"],
             "response_obj": None,
         }
 
+    # Syntax-only check: nothing else to compare
+    if not check_required_fields:
+        return {"valid": True, "errors": [], "response_obj": response_obj}
+
+    return validate_response_obj(response_obj)
+
+
+def validate_response_obj(response_obj, check_required_fields=True):
+    """
+    Validate an already parsed response object.
+
+    Lets callers that already hold the parsed response (e.g. the result of
+    execute_subagent) skip reading and decoding response.json again.
+
+    Args:
+        response_obj: Parsed response.json content
+        check_required_fields: Whether to check for required fields
+
+    Returns:
+        dict: Validation result, same shape as validate_response_file
+    """
+    errors = []
+
     # Load template and compare fields
     if check_required_fields:
         try:
-            template = load_response_template()
-            template_fields = set(template.keys())
-            actual_fields = set(response_obj.keys())
-
+            template_fields = get_response_fields()
+            # Set operations against the response's key view
             # Check for missing fields
-            missing_fields = template_fields - actual_fields
+            missing_fields = template_fields - response_obj.keys()
             if missing_fields:
                 errors.append(f"Response JSON missing fields: {', '.join(sorted(missing_fields))}")
 
             # Check for extra fields
-            extra_fields = actual_fields - template_fields
+            extra_fields = response_obj.keys() - template_fields
             if extra_fields:
                 errors.append(f"Response JSON has extra fields not in template: {', '.join(sorted(extra_fields))}")
 
             # Validate status field value
             if "status" in response_obj:
-                valid_statuses = ("success", "partial", "failed")
-                if response_obj["status"] not in valid_statuses:
-                    errors.append(f"Invalid status: {response_obj['status']}. Must be one of {valid_statuses}")
+                status = response_obj["status"]
+                # Non-string values (possibly unhashable) are never valid
+                if not isinstance(status, str) or status not in _VALID_STATUSES:
+                    errors.append(f"Invalid status: {status}. Must be one of {_STATUS_CHOICES}")
 
         except Exception as e:
             # If template loading fails, report error
@@ -108,7 +129,7 @@ def print_validation_result(result, output_format="text"):
         if result["response_obj"]:
             output["status"] = result["response_obj"].get("status", "N/A")
             output["summary"] = result["response_obj"].get("summary", "")
-        print(json.dumps(output, ensure_ascii=False, indent=2))
+        print(dump_json(output, indent=True))
     else:
         if result["valid"]:
             status = result["response_obj"].get("status", "N/A") if result["response_obj"] else "N/A"
@@ -139,7 +160,7 @@ def main():
     )
     parser.add_argument(
         "--check-status",
-        choices=["success", "partial", "failed"],
+        choices=_STATUS_CHOICES,
         help="Check if response status matches the specified value.",
     )
     args = parser.parse_args()
@@ -5,8 +5,20 @@ Schema loader for request.json and response.json templates.
 This module dynamically loads schema definitions from template files,
 ensuring a single source of truth for JSON structure validation.
 """
+import copy
+import functools
 import json
+import sys
 from pathlib import Path
+from types import SimpleNamespace
+
+# Templates are parsed by the same mtime-keyed loader as lib's other JSON
+try:
+    from . import _load_json_file_cached
+except ImportError:
+    # Run as a standalone script: import the same loader from lib
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from lib import _load_json_file_cached
 
 
 # Default template paths (relative to project root)
@@ -14,11 +26,29 @@ DEFAULT_TEMPLATE_DIR = Path(".agent/templates")
 REQUEST_TEMPLATE = DEFAULT_TEMPLATE_DIR / "template_request.json"
 RESPONSE_TEMPLATE = DEFAULT_TEMPLATE_DIR / "template_response.json"
 
+# Template directory relative to any candidate project root
+_TEMPLATE_SUFFIX = (".agent", "templates")
+
+# Fields that must always be present (even if empty in template)
+_REQUEST_REQUIRED = ("task", "context", "constraints")
+_RESPONSE_REQUIRED = ("version", "task_id", "status", "summary", "outputs", "issues")
+
+_REQUEST_REQUIRED_SET = frozenset(_REQUEST_REQUIRED)
+
+# Fields each template is expected to define
+_EXPECTED_REQUEST_FIELDS = frozenset(
+    ("version", "task_id", "task", "context", "constraints", "acceptance_criteria")
+)
+_EXPECTED_RESPONSE_FIELDS = frozenset(_RESPONSE_REQUIRED)
 
+
+@functools.lru_cache(maxsize=None)
 def _find_template_dir(start_dir=None):
     """
     Find the template directory by searching up from start_dir.
 
+    The result is cached per start_dir; see reload_templates().
+
     Args:
         start_dir: Directory to start searching from (default: current file's directory)
 
@@ -26,14 +56,19 @@ def _find_template_dir(start_dir=None):
         Path: Found template directory
     """
     if start_dir is None:
-        start_dir = Path(__file__).parent.parent.parent
+        # This file lives in <root>/.agent/tools/lib/, so try <root> first
+        here = Path(__file__).resolve()
+        template_dir = here.parents[3].joinpath(*_TEMPLATE_SUFFIX)
+        if template_dir.is_dir():
+            return template_dir
+        start_dir = here.parent.parent.parent
 
     current = Path(start_dir).resolve()
 
     # Search up to 5 levels
     for _ in range(5):
-        template_dir = current / ".agent" / "templates"
-        if template_dir.exists():
+        template_dir = current.joinpath(*_TEMPLATE_SUFFIX)
+        if template_dir.is_dir():
             return template_dir
         parent = current.parent
         if parent == current:  # Reached root
@@ -42,7 +77,7 @@ def _find_template_dir(start_dir=None):
 
     # Fallback to relative path from current directory
     fallback = Path(".agent/templates")
-    if fallback.exists():
+    if fallback.is_dir():
         return fallback
 
     raise FileNotFoundError(
@@ -51,10 +86,26 @@ def _find_template_dir(start_dir=None):
     )
 
 
+def _request_template():
+    """Parsed template_request.json, cached until the file changes (shared, do not mutate)."""
+    template_dir = _find_template_dir()
+    template_path = template_dir / "template_request.json"
+
+    try:
+        mtime_ns = template_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Request template not found: {template_path}")
+
+    return _load_json_file_cached(str(template_path.resolve()), mtime_ns)
+
+
 def load_request_template():
     """
     Load request.json template.
 
+    Parsing is cached until the template file changes; each call returns a
+    fresh copy that the caller may modify.
+
     Returns:
         dict: Parsed template object
 
@@ -62,20 +113,29 @@ def load_request_template():
         FileNotFoundError: If template file not found
         json.JSONDecodeError: If template is invalid JSON
     """
+    return copy.deepcopy(_request_template())
+
+
+def _response_template_key():
+    """Return the (resolved path, mtime) cache key of template_response.json."""
     template_dir = _find_template_dir()
-    template_path = template_dir / "template_request.json"
+    template_path = template_dir / "template_response.json"
 
-    if not template_path.exists():
-        raise FileNotFoundError(f"Request template not found: {template_path}")
+    try:
+        mtime_ns = template_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Response template not found: {template_path}")
 
-    content = template_path.read_text(encoding="utf-8-sig")
-    return json.loads(content)
+    return str(template_path.resolve()), mtime_ns
 
 
 def load_response_template():
     """
     Load response.json template.
 
+    Parsing is cached until the template file changes; each call returns a
+    fresh copy that the caller may modify.
+
     Returns:
         dict: Parsed template object
 
@@ -83,14 +143,45 @@ def load_response_template():
         FileNotFoundError: If template file not found
         json.JSONDecodeError: If template is invalid JSON
     """
-    template_dir = _find_template_dir()
-    template_path = template_dir / "template_response.json"
+    return copy.deepcopy(_response_schema().template)
+
+
+@functools.lru_cache(maxsize=None)
+def _response_schema_cached(path_str, mtime_ns):
+    """Derive the response schema from one parsed template."""
+    template = _load_json_file_cached(path_str, mtime_ns)
+    return SimpleNamespace(
+        template=template,
+        fields=frozenset(template),
+        # Required fields absent from the template, sorted
+        missing=sorted(_EXPECTED_RESPONSE_FIELDS - template.keys()),
+    )
+
+
+def _response_schema():
+    """
+    Everything derived from template_response.json, computed in one pass.
+
+    Cached until the template file changes.
+
+    Returns:
+        SimpleNamespace: template, fields (frozenset) and missing (list of
+            required fields the template lacks); all shared between calls,
+            do not mutate
+    """
+    return _response_schema_cached(*_response_template_key())
 
-    if not template_path.exists():
-        raise FileNotFoundError(f"Response template not found: {template_path}")
 
-    content = template_path.read_text(encoding="utf-8-sig")
-    return json.loads(content)
+def reload_templates():
+    """
+    Drop cached template lookups.
+
+    Templates are re-read automatically when their mtime changes; this also
+    forgets the template directory location, e.g. after changing directory.
+    """
+    _find_template_dir.cache_clear()
+    _load_json_file_cached.cache_clear()
+    _response_schema_cached.cache_clear()
 
 
 def get_request_required_fields():
@@ -104,19 +195,16 @@ def get_request_required_fields():
         This function determines required fields by checking which
         fields have non-empty placeholder values in the template.
     """
-    template = load_request_template()
-
-    # Fields that should always be present (even if empty in template)
-    always_required = ("task", "context", "constraints")
+    template = _request_template()
 
     # Validate that all required fields exist in template
-    missing = [f for f in always_required if f not in template]
+    missing = sorted(_REQUEST_REQUIRED_SET - template.keys())
     if missing:
         raise ValueError(
             f"Request template missing required fields: {', '.join(missing)}"
         )
 
-    return always_required
+    return _REQUEST_REQUIRED
 
 
 def get_response_required_fields():
@@ -130,19 +218,33 @@ def get_response_required_fields():
         This function determines required fields by checking which
         fields have non-empty placeholder values in the template.
     """
-    template = load_response_template()
-
-    # Fields that should always be present (even if empty in template)
-    always_required = ("version", "task_id", "status", "summary", "outputs", "issues")
-
-    # Validate that all required fields exist in template
-    missing = [f for f in always_required if f not in template]
+    missing = _response_schema().missing
     if missing:
         raise ValueError(
             f"Response template missing required fields: {', '.join(missing)}"
         )
 
-    return always_required
+    return _RESPONSE_REQUIRED
+
+
+def get_request_fields():
+    """
+    Get the top-level field names of the request template.
+
+    Returns:
+        frozenset: Field names of template_request.json
+    """
+    return frozenset(_request_template())
+
+
+def get_response_fields():
+    """
+    Get the top-level field names of the response template.
+
+    Returns:
+        frozenset: Field names of template_response.json
+    """
+    return _response_schema().fields
 
 
 def get_response_default_values():
@@ -150,24 +252,18 @@ def get_response_default_values():
     Get default values for response fields from template.
 
     Returns:
-        dict: Default values for response fields
+        dict: Default values for response fields (a new dict with new
+            empty lists/dicts on every call)
 
     Useful for:
         - Creating fallback responses
         - Initializing response objects
     """
-    template = load_response_template()
-
-    defaults = {}
-    for key, value in template.items():
-        if isinstance(value, (str, int, float, bool, type(None))):
-            defaults[key] = value
-        elif isinstance(value, list):
-            defaults[key] = []
-        elif isinstance(value, dict):
-            defaults[key] = {}
-
-    return defaults
+    # Scalars keep their template value, lists/dicts start out empty
+    return {
+        key: type(value)() if isinstance(value, (list, dict)) else value
+        for key, value in _response_schema().template.items()
+    }
 
 
 def validate_template_consistency():
@@ -184,20 +280,17 @@ def validate_template_consistency():
     warnings = []
 
     try:
-        request_template = load_request_template()
-        response_template = load_response_template()
+        request_template = _request_template()
+        response_schema = _response_schema()
+        response_template = response_schema.template
 
         # Check request template
-        expected_request_fields = ["version", "task_id", "task", "context", "constraints", "acceptance_criteria"]
-        for field in expected_request_fields:
-            if field not in request_template:
-                errors.append(f"Request template missing field: {field}")
+        for field in sorted(_EXPECTED_REQUEST_FIELDS - request_template.keys()):
+            errors.append(f"Request template missing field: {field}")
 
         # Check response template
-        expected_response_fields = ["version", "task_id", "status", "summary", "outputs", "issues"]
-        for field in expected_response_fields:
-            if field not in response_template:
-                errors.append(f"Response template missing field: {field}")
+        for field in response_schema.missing:
+            errors.append(f"Response template missing field: {field}")
 
         # Check version consistency
         if request_template.get("version") != response_template.get("version"):
@@ -9,12 +9,20 @@ This script orchestrates the complete Subagent workflow:
 4. Validate response.json
 
 This is the primary interface for Master Agent to delegate tasks to Subagents.
+
+With --batch, several independent Subagents listed in a manifest file are
+run concurrently (at most --max-parallel at a time).
 """
 import argparse
+import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
 
 from lib import (
     default_codex_cmd,
+    load_json_file,
     REQUIRED_FIELDS,
 )
 from lib.modules import (
@@ -22,11 +30,167 @@ from lib.modules import (
     validate_request_file,
     execute_subagent,
     execute_subagent_claude,
+    kill_running_subagents,
     validate_response_file,
+    validate_response_obj,
 )
+from lib.modules.run_subagent_exec import _exit_on_sigterm
+
+
+def run_pipeline(args, request_path, response_path):
+    """
+    Validate the request, run the Subagent and validate the response.
+
+    Args:
+        args: Parsed command line arguments (engine and its options)
+        request_path: Path to request.json
+        response_path: Path to response.json (will be created)
+
+    Returns:
+        int: Exit code (0 for success, non-zero for failure)
+    """
+    # Step 2: Validate request.json
+    validation_result = validate_request_file(request_path)
+    if not validation_result["valid"]:
+        errors = validation_result["errors"]
+        # Filter out warnings
+        real_errors = [e for e in errors if not e.startswith("Warning:")]
+        if real_errors:
+            print(f"Request validation failed: {request_path}", file=sys.stderr)
+            for error in real_errors:
+                print(f"  {error}", file=sys.stderr)
+            return 1
+
+    # Step 3: Execute Subagent via selected engine
+    response_obj = None
+    if args.engine == "codex":
+        exit_code, response_obj = execute_subagent(
+            request_path=request_path,
+            response_path=response_path,
+            prompt_file=args.prompt_file,
+            codex_cmd=args.codex_cmd,
+            profile=args.profile,
+            sandbox=args.sandbox,
+            cd=args.cd,
+            skip_git_repo_check=args.skip_git_repo_check,
+            idle_timeout=args.idle_timeout,
+            codex_args=args.codex_args,
+            request_obj=validation_result["request_obj"],
+            overall_timeout=args.overall_timeout,
+            child_nice=args.child_nice,
+            child_cpus=args.child_cpus,
+        )
+    elif args.engine == "claude":
+        exit_code = execute_subagent_claude(
+            request_path=request_path,
+            response_path=response_path,
+            prompt_file=args.prompt_file,
+            api_key=args.api_key,
+            model=args.model,
+            cwd=args.cd,
+            request_obj=validation_result["request_obj"],
+        )
+    else:
+        print(f"Error: Unknown engine '{args.engine}'", file=sys.stderr)
+        return 1
+
+    # Step 4: Validate response.json (best effort, don't fail if invalid).
+    # Reuse the response already parsed by the executor when there is one.
+    if response_obj is not None:
+        response_result = validate_response_obj(response_obj)
+    else:
+        response_result = validate_response_file(response_path)
+    if not response_result["valid"]:
+        print(f"Warning: Response validation failed: {response_path}", file=sys.stderr)
+        for error in response_result["errors"]:
+            print(f"  {error}", file=sys.stderr)
+
+    return exit_code
+
+
+def load_manifest(manifest_path):
+    """
+    Load a batch manifest.
+
+    The manifest is a JSON list with one object per Subagent, each holding
+    either "request"/"response" paths or "phase"/"task"/"subagent" names.
+
+    Returns:
+        list: Manifest entries
+    """
+    manifest_path = Path(manifest_path)
+    try:
+        manifest = load_json_file(manifest_path)
+    except FileNotFoundError:
+        raise SystemExit(f"Batch manifest not found: {manifest_path}")
+    except ValueError as e:
+        raise SystemExit(f"Batch manifest is invalid JSON: {manifest_path}: {e}")
+    if not isinstance(manifest, list) or not all(isinstance(item, dict) for item in manifest):
+        raise SystemExit(f"Batch manifest must be a JSON list of objects: {manifest_path}")
+    return manifest
 
 
-def main():
+def run_batch(args, manifest):
+    """
+    Run every Subagent in manifest concurrently, at most args.max_parallel at once.
+
+    Each pipeline runs in a worker thread; the engines spend their time
+    waiting on the Codex process or the API, not on the GIL. If the batch
+    is interrupted, entries not yet started are dropped and the running
+    Codex processes are killed.
+
+    Returns:
+        list: Exit code of each entry, in manifest order
+    """
+
+    def run_item(item):
+        # Identifies the entry in error messages until its paths are known
+        entry = item
+        try:
+            request_path, response_path = ensure_subagent_paths(
+                args.audit_root,
+                item.get("phase"),
+                item.get("task"),
+                item.get("subagent"),
+                item.get("request"),
+                item.get("response"),
+            )
+            entry = request_path
+            return run_pipeline(args, request_path, response_path)
+        # One bad entry must not abort the rest of the batch
+        except SystemExit as e:
+            print(f"Error: {entry}: {e}", file=sys.stderr)
+            return 1
+        except Exception as e:
+            print(f"Error: {entry}: {type(e).__name__}: {e}", file=sys.stderr)
+            return 1
+
+    # The pool size is the parallelism limit
+    executor = ThreadPoolExecutor(max_workers=args.max_parallel)
+    futures = []
+    try:
+        for item in manifest:
+            futures.append(executor.submit(run_item, item))
+        # Wait in slices: a wait without timeout cannot be interrupted by
+        # Ctrl-C on Windows
+        while wait(futures, timeout=1.0).not_done:
+            pass
+        return [future.result() for future in futures]
+    except BaseException:
+        # Worker threads never see the interrupt, and Codex runs in its own
+        # session, so stop them here rather than waiting out their timeouts.
+        # Kill repeatedly: a worker may be just about to start Codex
+        for future in futures:
+            future.cancel()
+        while wait(futures, timeout=0.1).not_done:
+            kill_running_subagents()
+        raise
+    finally:
+        executor.shutdown()
+
+
+def _build_parser():
+    """Build the command line parser (done once, at import time)."""
     parser = argparse.ArgumentParser(
         description="Create audit subagent directory and run Subagent.",
     )
@@ -59,6 +223,26 @@ def main():
     )
     parser.add_argument("--cd", default=".", help="Working directory for Codex exec (only for --engine codex).")
     parser.add_argument("--skip-git-repo-check", action="store_true", help="Skip git repo check (only for --engine codex).")
+    parser.add_argument(
+        "--overall-timeout",
+        type=float,
+        default=None,
+        help="Terminate if Codex runs longer than N seconds in total (only for --engine codex).",
+    )
+    parser.add_argument(
+        "--child-nice",
+        type=int,
+        default=None,
+        help="Run Codex at this niceness increment, e.g. 5 (POSIX only, only for --engine codex).",
+    )
+    parser.add_argument(
+        "--child-cpus",
+        type=int,
+        nargs="+",
+        default=None,
+        metavar="CPU",
+        help="Pin Codex to these CPU numbers (Linux only, only for --engine codex).",
+    )
     parser.add_argument(
         "--codex-args",
         nargs=argparse.REMAINDER,
@@ -73,69 +257,75 @@ def main():
     # Common parameters
     parser.add_argument("--idle-timeout", type=int, default=60, help="Terminate if stderr is silent for N seconds.")
 
-    args = parser.parse_args()
+    # Batch mode
+    parser.add_argument(
+        "--batch",
+        default=None,
+        help="Run all Subagents listed in this JSON manifest concurrently "
+        "(entries give request/response or phase/task/subagent).",
+    )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=4,
+        help="Maximum number of Subagents running at once with --batch. Default: 4",
+    )
 
-    # Set default codex command (only needed for codex engine)
-    if args.engine == "codex" and args.codex_cmd is None:
-        args.codex_cmd = default_codex_cmd()
+    return parser
 
-    # Step 1: Initialize audit directory structure
-    request_path, response_path = ensure_subagent_paths(
-        args.audit_root,
-        args.phase,
-        args.task_name,
-        args.subagent_name,
-        args.request,
-        args.response,
-    )
 
-    # Step 2: Validate request.json
-    validation_result = validate_request_file(request_path)
-    if not validation_result["valid"]:
-        errors = validation_result["errors"]
-        # Filter out warnings
-        real_errors = [e for e in errors if not e.startswith("Warning:")]
-        if real_errors:
-            print(f"Request validation failed:", file=sys.stderr)
-            for error in real_errors:
-                print(f"  {error}", file=sys.stderr)
-            sys.exit(1)
+# Shared by every main() call, so callers that run main() in-process
+# repeatedly do not rebuild it each time
+_PARSER = _build_parser()
 
-    # Step 3: Execute Subagent via selected engine
-    if args.engine == "codex":
-        exit_code = execute_subagent(
-            request_path=request_path,
-            response_path=response_path,
-            prompt_file=args.prompt_file,
-            codex_cmd=args.codex_cmd,
-            profile=args.profile,
-            sandbox=args.sandbox,
-            cd=args.cd,
-            skip_git_repo_check=args.skip_git_repo_check,
-            idle_timeout=args.idle_timeout,
-            codex_args=args.codex_args,
-        )
-    elif args.engine == "claude":
-        exit_code = execute_subagent_claude(
-            request_path=request_path,
-            response_path=response_path,
-            prompt_file=args.prompt_file,
-            api_key=args.api_key,
-            model=args.model,
-            cwd=args.cd,
-        )
-    else:
-        print(f"Error: Unknown engine '{args.engine}'", file=sys.stderr)
-        sys.exit(1)
 
-    # Step 4: Validate response.json (best effort, don't fail if invalid)
-    response_result = validate_response_file(response_path)
-    if not response_result["valid"]:
-        print("Warning: Response validation failed:", file=sys.stderr)
-        for error in response_result["errors"]:
-            print(f"  {error}", file=sys.stderr)
+def main(argv=None):
+    """
+    Run the CLI.
+
+    Args:
+        argv: Argument list to parse instead of sys.argv[1:]
+    """
+    args = _PARSER.parse_args(argv)
+    if args.max_parallel < 1:
+        _PARSER.error("--max-parallel must be at least 1")
+
+    # Codex runs in its own session, so SIGTERM would end this process and
+    # leave Codex running; unwind like Ctrl-C instead so it is killed too.
+    # Signal handlers can only be set from the main thread
+    previous_sigterm = None
+    if threading.current_thread() is threading.main_thread():
+        previous_sigterm = signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    try:
+        # Set default codex command (only needed for codex engine)
+        if args.engine == "codex" and args.codex_cmd is None:
+            args.codex_cmd = default_codex_cmd()
+
+        if args.batch:
+            manifest = load_manifest(args.batch)
+            try:
+                exit_codes = run_batch(args, manifest)
+            except KeyboardInterrupt:
+                print("Batch interrupted", file=sys.stderr)
+                sys.exit(130)
+            failed = sum(1 for code in exit_codes if code != 0)
+            print(f"Batch finished: {len(exit_codes) - failed} succeeded, {failed} failed")
+            sys.exit(1 if failed else 0)
+
+        # Step 1: Initialize audit directory structure
+        request_path, response_path = ensure_subagent_paths(
+            args.audit_root,
+            args.phase,
+            args.task_name,
+            args.subagent_name,
+            args.request,
+            args.response,
+        )
 
-    sys.exit(exit_code)
+        sys.exit(run_pipeline(args, request_path, response_path))
+    finally:
+        if previous_sigterm is not None:
+            signal.signal(signal.SIGTERM, previous_sigterm)
 
 
 if __name__ == "__main__":